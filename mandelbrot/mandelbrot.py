@@ -21,8 +21,10 @@ Usage:
     python3 mandelbrot.py --connection     # the link to the logistic map
 """
 
+import functools
 import math
 import sys
+from array import array
 
 # ── terminal codes ──────────────────────────────────────────
 RST = "\033[0m"
@@ -48,6 +50,9 @@ HALF_BLOCK_TOP = '▀'
 HALF_BLOCK_BOT = '▄'
 FULL_BLOCK = '█'
 
+# Progress bars for 0%, 5%, ..., 100%
+PROGRESS_BARS = ['█' * i + '░' * (20 - i) for i in range(21)]
+
 
 def fg_rgb(r, g, b):
     """24-bit foreground color."""
@@ -132,9 +137,10 @@ def smooth_escape(n, z_mag2, max_iter):
     """Smooth iteration count for gradient coloring."""
     if n >= max_iter:
         return max_iter
-    # Normalized iteration count (avoids banding)
+    # Normalized iteration count (avoids banding):
+    #   n + 1 - log2(ln|z|) = n + 2 - log2(ln|z|²)
     if z_mag2 > 1.0:
-        return n + 1.0 - math.log(math.log(math.sqrt(z_mag2))) / math.log(2.0)
+        return n + 2.0 - math.log2(math.log(z_mag2))
     return n
 
 
@@ -172,75 +178,88 @@ def detect_period(c_re, c_im, max_iter=1000):
 def compute_grid(x_min, x_max, y_min, y_max, width, height, max_iter=200,
                  progress=False):
     """Compute Mandelbrot escape data for a grid of points.
-    Returns 2D list of (smooth_n, period) tuples."""
-    grid = []
+    Returns (smooth_n, n): two lists of rows, stored as array('f') and
+    array('i') so each cell costs 8 bytes instead of a tuple."""
+    dx = (x_max - x_min) / (width - 1)
+    dy = (y_max - y_min) / (height - 1)
+    sn_rows, n_rows = [], []
     for row in range(height):
         if progress and row % 5 == 0:
             pct = row * 100 // height
-            bar = '█' * (pct // 5) + '░' * (20 - pct // 5)
-            sys.stdout.write(f"\r  {DIM}[{bar}] {pct}%{RST}")
+            sys.stdout.write(f"\r  {DIM}[{PROGRESS_BARS[pct // 5]}] {pct}%{RST}")
             sys.stdout.flush()
-        y = y_max - (y_max - y_min) * row / (height - 1)
-        line = []
+        y = y_max - dy * row
+        sn_row = array('f', [0.0]) * width
+        n_row = array('i', [0]) * width
         for col in range(width):
-            x = x_min + (x_max - x_min) * col / (width - 1)
+            x = x_min + dx * col
             n, z_mag2 = mandelbrot_escape(x, y, max_iter)
-            sn = smooth_escape(n, z_mag2, max_iter)
-            line.append((sn, n))
-        grid.append(line)
+            sn_row[col] = smooth_escape(n, z_mag2, max_iter)
+            n_row[col] = n
+        sn_rows.append(sn_row)
+        n_rows.append(n_row)
     if progress:
         sys.stdout.write(f"\r{'':40s}\r")
         sys.stdout.flush()
-    return grid
+    return sn_rows, n_rows
 
 
 # ── rendering ───────────────────────────────────────────────
 
+# Escape-speed levels in the half-block palette; one more slot for interior
+PALETTE_LEVELS = 256
+INTERIOR_RGB = (15, 15, 25)  # deep navy
+
+
+@functools.lru_cache(maxsize=8)
+def halfblock_palette(max_iter):
+    """Pre-rendered fg/bg escape codes for each palette level.
+    Index PALETTE_LEVELS is the interior color."""
+    rgbs = [palette_escape(i * max_iter / PALETTE_LEVELS, max_iter)
+            for i in range(PALETTE_LEVELS)]
+    rgbs.append(INTERIOR_RGB)
+    fg = [fg_rgb(*rgb) for rgb in rgbs]
+    bg = [bg_rgb(*rgb) for rgb in rgbs]
+    return fg, bg
+
+
+def palette_levels(sn_row, n_row, max_iter):
+    """Map one grid row to half-block palette indices."""
+    scale = PALETTE_LEVELS / max_iter
+    top = PALETTE_LEVELS - 1
+    return [PALETTE_LEVELS if n >= max_iter else min(top, int(sn * scale))
+            for sn, n in zip(sn_row, n_row)]
+
+
 def render_halfblock(grid, max_iter, x_min, x_max, y_min, y_max):
     """Render with half-block characters for 2x vertical resolution.
     Each character cell encodes two vertically stacked pixels using
     foreground (top) and background (bottom) colors."""
-    height = len(grid)
-    width = len(grid[0]) if grid else 0
+    sn_rows, n_rows = grid
+    height = len(n_rows)
+    fg, bg = halfblock_palette(max_iter)
+    cell = f"{HALF_BLOCK_TOP}{RST}"
     lines = []
 
-    # Process rows in pairs
+    # Process rows in pairs: top pixel as foreground, bottom as background
     for row_pair in range(0, height - 1, 2):
-        chars = []
-        for col in range(width):
-            sn_top, n_top = grid[row_pair][col]
-            sn_bot, n_bot = grid[row_pair + 1][col]
-
-            # Get colors
-            if n_top >= max_iter:
-                r_t, g_t, b_t = 15, 15, 25  # deep navy for interior
-            else:
-                r_t, g_t, b_t = palette_escape(sn_top, max_iter)
-
-            if n_bot >= max_iter:
-                r_b, g_b, b_b = 15, 15, 25
-            else:
-                r_b, g_b, b_b = palette_escape(sn_bot, max_iter)
-
-            # Top pixel as foreground, bottom as background
-            chars.append(f"{fg_rgb(r_t, g_t, b_t)}{bg_rgb(r_b, g_b, b_b)}"
-                         f"{HALF_BLOCK_TOP}{RST}")
-
-        lines.append("  " + "".join(chars))
+        top = palette_levels(sn_rows[row_pair], n_rows[row_pair], max_iter)
+        bot = palette_levels(sn_rows[row_pair + 1], n_rows[row_pair + 1],
+                             max_iter)
+        lines.append("  " + "".join([fg[t] + bg[b] + cell
+                                     for t, b in zip(top, bot)]))
 
     return lines
 
 
 def render_simple(grid, max_iter, x_min, x_max, y_min, y_max):
     """Render with density characters and 16-color palette."""
-    height = len(grid)
-    width = len(grid[0]) if grid else 0
+    sn_rows, n_rows = grid
     lines = []
 
-    for row in range(height):
+    for sn_row, n_row in zip(sn_rows, n_rows):
         chars = []
-        for col in range(width):
-            sn, n = grid[row][col]
+        for sn, n in zip(sn_row, n_row):
             if n >= max_iter:
                 chars.append(f"{B_WHT}*{RST}")
             elif n == 0:
@@ -273,9 +292,9 @@ def render_simple(grid, max_iter, x_min, x_max, y_min, y_max):
     return lines
 
 
-def print_axes(x_min, x_max, width, label="Re(c)"):
-    """Print axis labels below a rendered diagram."""
-    print(f"  {DIM}" + "─" * width + f"{RST}")
+def axis_lines(x_min, x_max, width, label="Re(c)"):
+    """Axis labels to go below a rendered diagram, as a list of lines."""
+    lines = [f"  {DIM}" + "─" * width + f"{RST}"]
 
     # Adaptive decimal places based on range
     span = x_max - x_min
@@ -297,8 +316,14 @@ def print_axes(x_min, x_max, width, label="Re(c)"):
         if needed > 0:
             label_line += " " * needed
         label_line += f"{x_val:{fmt}}"
-    print(f"{DIM}{label_line}{RST}")
-    print(f"{DIM}{label:^{width + 4}s}{RST}")
+    lines.append(f"{DIM}{label_line}{RST}")
+    lines.append(f"{DIM}{label:^{width + 4}s}{RST}")
+    return lines
+
+
+def emit(lines):
+    """Write a batch of lines to stdout in one call."""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # ── modes ───────────────────────────────────────────────────
@@ -321,30 +346,31 @@ def mode_full(use_halfblock=True):
     grid = compute_grid(x_min, x_max, y_min, y_max, width, height, max_iter)
     sys.stdout.write(f"\r{'':40s}\r")
 
-    print(f"  {BLD}THE MANDELBROT SET{RST}")
-    print(f"  {DIM}z → z² + c,  z₀ = 0{RST}")
-    print(f"  {DIM}Colored by escape speed. Interior (bounded orbits) in dark.{RST}")
-    print()
+    out = []
+    out.append(f"  {BLD}THE MANDELBROT SET{RST}")
+    out.append(f"  {DIM}z → z² + c,  z₀ = 0{RST}")
+    out.append(f"  {DIM}Colored by escape speed. Interior (bounded orbits) in dark.{RST}")
+    out.append("")
 
     if use_halfblock:
         lines = render_halfblock(grid, max_iter, x_min, x_max, y_min, y_max)
     else:
         lines = render_simple(grid, max_iter, x_min, x_max, y_min, y_max)
 
-    for line in lines:
-        print(line)
+    out.extend(lines)
 
-    print_axes(x_min, x_max, width)
+    out.extend(axis_lines(x_min, x_max, width))
 
-    print()
-    print(f"  {B_WHT}Main cardioid{RST}: period-1 orbits "
-          f"(c where |z| stays bounded at a fixed point)")
-    print(f"  {B_CYN}Period-2 bulb{RST}: the large circle to the left "
-          f"(period-doubling begins)")
-    print(f"  {B_YLW}Antenna{RST}: the spike along the negative real axis "
-          f"(chaos region)")
-    print(f"  {DIM}Every bulb, bud, and filament has a period. "
-          f"Zoom in anywhere and find more.{RST}")
+    out.append("")
+    out.append(f"  {B_WHT}Main cardioid{RST}: period-1 orbits "
+               f"(c where |z| stays bounded at a fixed point)")
+    out.append(f"  {B_CYN}Period-2 bulb{RST}: the large circle to the left "
+               f"(period-doubling begins)")
+    out.append(f"  {B_YLW}Antenna{RST}: the spike along the negative real axis "
+               f"(chaos region)")
+    out.append(f"  {DIM}Every bulb, bud, and filament has a period. "
+               f"Zoom in anywhere and find more.{RST}")
+    emit(out)
 
 
 def mode_zoom():
@@ -362,21 +388,22 @@ def mode_zoom():
     grid = compute_grid(x_min, x_max, y_min, y_max, width, height, max_iter)
     sys.stdout.write(f"\r{'':40s}\r")
 
-    print(f"  {BLD}ZOOM: THE ANTENNA — PERIOD-DOUBLING CASCADE{RST}")
-    print(f"  {DIM}c = {x_min} to {x_max}, zoomed into the real axis{RST}")
-    print(f"  {DIM}This is the bifurcation diagram viewed from the complex plane.{RST}")
-    print()
+    out = []
+    out.append(f"  {BLD}ZOOM: THE ANTENNA — PERIOD-DOUBLING CASCADE{RST}")
+    out.append(f"  {DIM}c = {x_min} to {x_max}, zoomed into the real axis{RST}")
+    out.append(f"  {DIM}This is the bifurcation diagram viewed from the complex plane.{RST}")
+    out.append("")
 
     lines = render_halfblock(grid, max_iter, x_min, x_max, y_min, y_max)
-    for line in lines:
-        print(line)
+    out.extend(lines)
 
-    print_axes(x_min, x_max, width)
+    out.extend(axis_lines(x_min, x_max, width))
 
-    print()
-    print(f"  {DIM}The period-2 bulb splits into period-4, period-8, ...{RST}")
-    print(f"  {DIM}The cascade converges to c ≈ -1.4012 (the Feigenbaum point).{RST}")
-    print(f"  {DIM}Beyond: chaos, with tiny copies of the whole set (mini-brots).{RST}")
+    out.append("")
+    out.append(f"  {DIM}The period-2 bulb splits into period-4, period-8, ...{RST}")
+    out.append(f"  {DIM}The cascade converges to c ≈ -1.4012 (the Feigenbaum point).{RST}")
+    out.append(f"  {DIM}Beyond: chaos, with tiny copies of the whole set (mini-brots).{RST}")
+    emit(out)
 
 
 def mode_deep():
@@ -395,23 +422,24 @@ def mode_deep():
     grid = compute_grid(x_min, x_max, y_min, y_max, width, height, max_iter,
                         progress=True)
 
-    print(f"  {BLD}DEEP ZOOM: MINI-MANDELBROT{RST}")
-    print(f"  {DIM}Center: c = {cx} + {cy}i{RST}")
-    print(f"  {DIM}Zoom: ~1000x from the full set{RST}")
-    print(f"  {DIM}A tiny copy of the entire Mandelbrot set, hidden in the antenna.{RST}")
-    print()
+    out = []
+    out.append(f"  {BLD}DEEP ZOOM: MINI-MANDELBROT{RST}")
+    out.append(f"  {DIM}Center: c = {cx} + {cy}i{RST}")
+    out.append(f"  {DIM}Zoom: ~1000x from the full set{RST}")
+    out.append(f"  {DIM}A tiny copy of the entire Mandelbrot set, hidden in the antenna.{RST}")
+    out.append("")
 
     lines = render_halfblock(grid, max_iter, x_min, x_max, y_min, y_max)
-    for line in lines:
-        print(line)
+    out.extend(lines)
 
-    print_axes(x_min, x_max, width)
+    out.extend(axis_lines(x_min, x_max, width))
 
-    print()
-    print(f"  {DIM}Self-similarity: the whole set contains infinitely many copies{RST}")
-    print(f"  {DIM}of itself, at every scale. Each copy is connected to the rest{RST}")
-    print(f"  {DIM}by infinitely thin filaments. The boundary has fractal dimension 2{RST}")
-    print(f"  {DIM}— it's as complicated as a surface, despite being a curve.{RST}")
+    out.append("")
+    out.append(f"  {DIM}Self-similarity: the whole set contains infinitely many copies{RST}")
+    out.append(f"  {DIM}of itself, at every scale. Each copy is connected to the rest{RST}")
+    out.append(f"  {DIM}by infinitely thin filaments. The boundary has fractal dimension 2{RST}")
+    out.append(f"  {DIM}— it's as complicated as a surface, despite being a curve.{RST}")
+    emit(out)
 
 
 def mode_connection():
@@ -424,13 +452,14 @@ def mode_connection():
     logistic map. We show them aligned."""
 
     width = 100
-    print(f"  {BLD}THE MANDELBROT — LOGISTIC MAP CONNECTION{RST}")
-    print()
-    print(f"  {DIM}The logistic map  x → rx(1-x)  is conjugated to  z → z² + c  by:{RST}")
-    print(f"  {B_WHT}c = r/2 - r²/4 = -(r-1)²/4 + 1/4{RST}")
-    print()
-    print(f"  {DIM}So the real axis of the Mandelbrot set IS the bifurcation diagram.{RST}")
-    print()
+    out = []
+    out.append(f"  {BLD}THE MANDELBROT — LOGISTIC MAP CONNECTION{RST}")
+    out.append("")
+    out.append(f"  {DIM}The logistic map  x → rx(1-x)  is conjugated to  z → z² + c  by:{RST}")
+    out.append(f"  {B_WHT}c = r/2 - r²/4 = -(r-1)²/4 + 1/4{RST}")
+    out.append("")
+    out.append(f"  {DIM}So the real axis of the Mandelbrot set IS the bifurcation diagram.{RST}")
+    out.append("")
 
     # Part 1: Mandelbrot set on the real axis
     # Map c from -2.0 to 0.25 (the range covered by r ∈ [0, 4])
@@ -448,17 +477,16 @@ def mode_connection():
                               width, strip_height, max_iter)
     sys.stdout.write(f"\r{'':40s}\r")
 
-    print(f"  {BLD}Mandelbrot set — real axis strip{RST}")
-    print(f"  {DIM}Im(c) = {y_min} to {y_max}{RST}")
-    print()
+    out.append(f"  {BLD}Mandelbrot set — real axis strip{RST}")
+    out.append(f"  {DIM}Im(c) = {y_min} to {y_max}{RST}")
+    out.append("")
 
     strip_lines = render_halfblock(strip_grid, max_iter,
                                    c_min, c_max, y_min, y_max)
-    for line in strip_lines:
-        print(line)
+    out.extend(strip_lines)
 
     # C-axis labels
-    print(f"  {DIM}" + "─" * width + f"{RST}")
+    out.append(f"  {DIM}" + "─" * width + f"{RST}")
     c_label = "  "
     for i in range(6):
         c_val = c_min + (c_max - c_min) * i / 5
@@ -467,15 +495,18 @@ def mode_connection():
         if needed > 0:
             c_label += " " * needed
         c_label += f"{c_val:+.2f}"
-    print(f"{DIM}{c_label}{RST}")
-    print(f"{DIM}{'c (real axis)':^{width + 4}s}{RST}")
+    out.append(f"{DIM}{c_label}{RST}")
+    out.append(f"{DIM}{'c (real axis)':^{width + 4}s}{RST}")
 
     # Part 2: Bifurcation diagram on the SAME c axis
     # For each c, compute r = 1 + sqrt(1 - 4c) (the interesting branch)
-    print()
-    print(f"  {BLD}Logistic map bifurcation diagram  (same c axis){RST}")
-    print(f"  {DIM}r = 1 + √(1 - 4c) maps each column to the logistic parameter{RST}")
-    print()
+    out.append("")
+    out.append(f"  {BLD}Logistic map bifurcation diagram  (same c axis){RST}")
+    out.append(f"  {DIM}r = 1 + √(1 - 4c) maps each column to the logistic parameter{RST}")
+    out.append("")
+
+    emit(out)
+    out = []
 
     bif_height = 30
     y_bif_min, y_bif_max = 0.0, 1.0
@@ -547,10 +578,10 @@ def mode_connection():
             label = f"{(y_bif_min + y_bif_max) / 2:.1f}"
         else:
             label = "    "
-        print(f"  {DIM}{label:>4s}{RST} │{''.join(chars)}│")
+        out.append(f"  {DIM}{label:>4s}{RST} │{''.join(chars)}│")
 
     # C-axis labels (same as above)
-    print(f"  {DIM}     └" + "─" * width + f"┘{RST}")
+    out.append(f"  {DIM}     └" + "─" * width + f"┘{RST}")
     c_label2 = "       "
     for i in range(6):
         c_val = c_min + (c_max - c_min) * i / 5
@@ -559,13 +590,13 @@ def mode_connection():
         if needed > 0:
             c_label2 += " " * needed
         c_label2 += f"{c_val:+.2f}"
-    print(f"  {DIM}{c_label2}{RST}")
-    print(f"  {DIM}{'c (same axis as Mandelbrot strip above)':^{width + 10}s}{RST}")
+    out.append(f"  {DIM}{c_label2}{RST}")
+    out.append(f"  {DIM}{'c (same axis as Mandelbrot strip above)':^{width + 10}s}{RST}")
 
     # Part 3: The mapping between r and c
-    print()
-    print(f"  {BLD}Parameter correspondence:{RST}")
-    print()
+    out.append("")
+    out.append(f"  {BLD}Parameter correspondence:{RST}")
+    out.append("")
 
     landmarks = [
         (1.0, "extinction threshold"),
@@ -591,12 +622,13 @@ def mode_connection():
             color = B_MAG
         else:
             color = B_RED
-        print(f"  {color}r = {r:.3f}  →  c = {c:+.4f}{RST}  {DIM}{desc}{RST}")
+        out.append(f"  {color}r = {r:.3f}  →  c = {c:+.4f}{RST}  {DIM}{desc}{RST}")
 
-    print()
-    print(f"  {DIM}The two diagrams are the same mathematical object.{RST}")
-    print(f"  {DIM}The Mandelbrot set extends this to the full complex plane —{RST}")
-    print(f"  {DIM}what the logistic map would look like with a complex parameter.{RST}")
+    out.append("")
+    out.append(f"  {DIM}The two diagrams are the same mathematical object.{RST}")
+    out.append(f"  {DIM}The Mandelbrot set extends this to the full complex plane —{RST}")
+    out.append(f"  {DIM}what the logistic map would look like with a complex parameter.{RST}")
+    emit(out)
 
 
 # ── main ────────────────────────────────────────────────────
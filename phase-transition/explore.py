@@ -29,12 +29,14 @@ Usage:
     python3 explore.py --set full        # all 12 strategies
 """
 
-import copy
+import functools
 import math
+import multiprocessing
 import random
 import sys
 import os
 import time
+from array import array
 
 # Add sibling directories for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'prisoners-dilemma'))
@@ -89,78 +91,142 @@ STRATEGY_SETS = {
 
 # ── grid simulation (lightweight, no display) ──────────────
 
+# Strategies that draw random numbers. Their matches have to be played
+# out every time; every other pairing always ends with the same score.
+STOCHASTIC = {GenerousTitForTat, RandomStrategy}
+
+
 def make_grid(width, height, strategy_classes, seed=None):
-    """Create a random grid of strategies."""
+    """Create a random grid of strategy ids (indices into strategy_classes).
+    Grids are flat bytearrays in reading order: cell (x, y) is y*width + x."""
     if seed is not None:
         random.seed(seed)
-    grid = []
-    for y in range(height):
+    k = len(strategy_classes)
+    return bytearray(random.randrange(k) for _ in range(width * height))
+
+
+def play_pair(cls_a, cls_b, rounds_per_match, payoffs):
+    """Play one match between fresh instances. Returns a's score.
+    Histories are passed without copying; strategies only read them."""
+    a = cls_a()
+    b = cls_b()
+    a.reset()
+    b.reset()
+    choose_a = a.choose
+    choose_b = b.choose
+
+    score = 0
+    hist_a, hist_b = [], []
+    append_a, append_b = hist_a.append, hist_b.append
+    for _ in range(rounds_per_match):
+        ma = choose_a(hist_a, hist_b)
+        mb = choose_b(hist_b, hist_a)
+        score += payoffs[ma][mb]
+        append_a(ma)
+        append_b(mb)
+    return score
+
+
+# Deterministic match scores, shared by every run in this process:
+# (cls_a, cls_b, rounds_per_match, payoff rows) -> a's score
+_PAIR_CACHE = {}
+
+
+def pair_table(strategy_classes, rounds_per_match, payoffs):
+    """Score of strategy i against strategy j, as table[i][j].
+    Pairings that involve a stochastic strategy are None."""
+    payoff_key = tuple(map(tuple, payoffs))
+    table = []
+    for cls_a in strategy_classes:
         row = []
-        for x in range(width):
-            cls = random.choice(strategy_classes)
-            row.append(cls())
-        grid.append(row)
-    return grid
-
-
-def compute_scores(grid, width, height, rounds_per_match, payoffs):
-    """Play each cell against its Moore neighborhood."""
-    scores = [[0.0] * width for _ in range(height)]
-
-    for y in range(height):
-        for x in range(width):
-            cell = grid[y][x]
-            for dy in (-1, 0, 1):
-                for dx in (-1, 0, 1):
-                    if dx == 0 and dy == 0:
-                        continue
-                    nx = (x + dx) % width
-                    ny = (y + dy) % height
-                    neighbor = grid[ny][nx]
-
-                    a = copy.deepcopy(cell)
-                    b = copy.deepcopy(neighbor)
-                    a.reset()
-                    b.reset()
-
-                    hist_a, hist_b = [], []
-                    for _ in range(rounds_per_match):
-                        ma = a.choose(list(hist_a), list(hist_b))
-                        mb = b.choose(list(hist_b), list(hist_a))
-                        scores[y][x] += payoffs[(ma, mb)]
-                        hist_a.append(ma)
-                        hist_b.append(mb)
+        for cls_b in strategy_classes:
+            if cls_a in STOCHASTIC or cls_b in STOCHASTIC:
+                row.append(None)
+                continue
+            key = (cls_a, cls_b, rounds_per_match, payoff_key)
+            if key not in _PAIR_CACHE:
+                _PAIR_CACHE[key] = play_pair(cls_a, cls_b,
+                                             rounds_per_match, payoffs)
+            row.append(_PAIR_CACHE[key])
+        table.append(row)
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def moore_windows(width, height):
+    """Flat indices of the wrapped 3x3 window around each cell, in reading
+    order (the cell itself is the middle entry). Built once per grid size."""
+    return [tuple(((y + dy) % height) * width + (x + dx) % width
+                  for dy in (-1, 0, 1) for dx in (-1, 0, 1))
+            for y in range(height) for x in range(width)]
+
+
+@functools.lru_cache(maxsize=None)
+def moore_neighbors(width, height):
+    """The 8 neighbors of each cell from moore_windows, without the cell."""
+    return [window[:4] + window[5:] for window in moore_windows(width, height)]
+
+
+def new_scores(width, height):
+    """A flat score plane of width * height doubles."""
+    return array('d', [0.0]) * (width * height)
+
+
+def compute_scores(grid, strategy_classes, width, height, rounds_per_match,
+                   payoffs, table, out=None):
+    """Play each cell against its Moore neighborhood.
+    Deterministic pairings are looked up in table; the rest are played.
+    Every cell of out is overwritten, so a buffer can be reused."""
+    neighbors = moore_neighbors(width, height)
+    scores = new_scores(width, height) if out is None else out
+
+    for i, a in enumerate(grid):
+        table_row = table[a]
+        total = 0.0
+        for j in neighbors[i]:
+            b = grid[j]
+            score = table_row[b]
+            if score is None:
+                score = play_pair(strategy_classes[a], strategy_classes[b],
+                                  rounds_per_match, payoffs)
+            total += score
+        scores[i] = total
 
     return scores
 
 
-def evolve_grid(grid, scores, width, height):
-    """Each cell adopts the strategy of its best-scoring neighbor."""
-    new_grid = [[None] * width for _ in range(height)]
-    for y in range(height):
-        for x in range(width):
-            best_score = scores[y][x]
-            best_cls = type(grid[y][x])
-            for dy in (-1, 0, 1):
-                for dx in (-1, 0, 1):
-                    if dx == 0 and dy == 0:
-                        continue
-                    nx = (x + dx) % width
-                    ny = (y + dy) % height
-                    if scores[ny][nx] > best_score:
-                        best_score = scores[ny][nx]
-                        best_cls = type(grid[ny][nx])
-            new_grid[y][x] = best_cls()
+# Scores closer than this count as a tie. Totals of non-integer payoffs
+# depend on the order they were summed in, so exact comparison would let
+# rounding decide between equally good neighbors.
+SCORE_TOL = 1e-9
+
+
+def evolve_grid(grid, scores, width, height, out=None):
+    """Each cell adopts the strategy of its best-scoring neighbor.
+    Only a neighbor scoring more than SCORE_TOL higher replaces the cell's
+    own strategy, so the cell wins every tie; among neighbors tied for the
+    best score, the first in reading order wins. The result goes into out
+    (which must not be grid) when given."""
+    windows = moore_windows(width, height)
+    new_grid = bytearray(width * height) if out is None else out
+    for i, window in enumerate(windows):
+        best_score = scores[i]
+        best = grid[i]
+        for j in window:
+            if scores[j] > best_score + SCORE_TOL:
+                best_score = scores[j]
+                best = grid[j]
+        new_grid[i] = best
     return new_grid
 
 
-def census(grid):
+def census(grid, strategy_classes):
     """Count population of each strategy."""
     counts = {}
-    for row in grid:
-        for cell in row:
-            name = cell.name
-            counts[name] = counts.get(name, 0) + 1
+    for i, cls in enumerate(strategy_classes):
+        n = grid.count(i)
+        if n:
+            counts[cls.name] = n
     return counts
 
 
@@ -176,27 +242,38 @@ def cooperation_fraction(counts):
 def run_simulation(temptation, strategy_classes, width=20, height=20,
                    rounds_per_match=8, generations=30, seed=42):
     """Run a spatial PD simulation with a given temptation value.
-    Returns the cooperation fraction at equilibrium."""
-
-    # Set the payoff matrix
-    payoffs = {
-        (COOPERATE, COOPERATE): 3,    # R
-        (COOPERATE, DEFECT):    0,    # S
-        (DEFECT,    COOPERATE): temptation,  # T
-        (DEFECT,    DEFECT):    1,    # P
-    }
+    Returns the cooperation fraction at equilibrium and the final census.
+    Stops as soon as the fraction is settled at 0 or 1, so the census may
+    still be shifting among strategies of the same kind."""
+
+    # Set the payoff matrix, indexed as payoffs[my_move][their_move]
+    payoffs = [[0, 0], [0, 0]]
+    payoffs[COOPERATE][COOPERATE] = 3           # R
+    payoffs[COOPERATE][DEFECT] = 0              # S
+    payoffs[DEFECT][COOPERATE] = temptation     # T
+    payoffs[DEFECT][DEFECT] = 1                 # P
 
     grid = make_grid(width, height, strategy_classes, seed=seed)
+    table = pair_table(strategy_classes, rounds_per_match, payoffs)
+
+    # Buffers reused every generation; grids ping-pong with spare
+    scores = new_scores(width, height)
+    spare = bytearray(width * height)
 
     prev_census = None
     stable_count = 0
 
     for gen in range(generations):
-        scores = compute_scores(grid, width, height, rounds_per_match, payoffs)
-        grid = evolve_grid(grid, scores, width, height)
-
-        # Check for convergence
-        current = census(grid)
+        compute_scores(grid, strategy_classes, width, height,
+                       rounds_per_match, payoffs, table, out=scores)
+        grid, spare = evolve_grid(grid, scores, width, height, out=spare), grid
+
+        # Check for convergence. Evolution only copies strategies that are
+        # still on the grid, so once every survivor is nice (or none is),
+        # the cooperation fraction can no longer change.
+        current = census(grid, strategy_classes)
+        if cooperation_fraction(current) in (0.0, 1.0):
+            break
         if current == prev_census:
             stable_count += 1
             if stable_count >= 3:
@@ -205,68 +282,153 @@ def run_simulation(temptation, strategy_classes, width=20, height=20,
             stable_count = 0
         prev_census = current
 
-    final = census(grid)
+    final = census(grid, strategy_classes)
     return cooperation_fraction(final), final
 
 
+def seed_for(i):
+    """Seed of the i-th simulation averaged at each temptation value."""
+    return 42 + i * 7
+
+
+def _simulate_task(task):
+    """Pool worker: cooperation fraction of one (temptation, seed) run."""
+    temptation, seed, strategy_classes, kwargs = task
+    coop, _ = run_simulation(temptation, strategy_classes, seed=seed, **kwargs)
+    return coop
+
+
+def sweep(pool, t_values, strategy_classes, n_seeds=5, **kwargs):
+    """Average n_seeds simulations with different seeds at every T.
+    The (T, seed) runs are spread over pool, or run here in turn when
+    pool is None.
+    Yields (t, average cooperation) in t_values order as results arrive."""
+    tasks = [(t, seed_for(i), strategy_classes, kwargs)
+             for t in t_values for i in range(n_seeds)]
+    if pool is None:
+        results = map(_simulate_task, tasks)
+    else:
+        results = pool.imap(_simulate_task, tasks)
+    for t in t_values:
+        total = 0.0
+        for _ in range(n_seeds):
+            total += next(results)
+        yield t, total / n_seeds
+
+
 def run_averaged(temptation, strategy_classes, n_seeds=5, **kwargs):
     """Run multiple simulations with different seeds and return the average."""
-    total = 0.0
-    for i in range(n_seeds):
-        coop, _ = run_simulation(temptation, strategy_classes, seed=42 + i * 7, **kwargs)
-        total += coop
-    return total / n_seeds
+    _, coop = next(sweep(None, [temptation], strategy_classes, n_seeds, **kwargs))
+    return coop
+
+
+def bisect_t(evaluate, lo, hi, c_lo, c_hi, below, tol):
+    """Narrow a bracket [lo, hi] down to width tol, where below(coop)
+    is false at lo (cooperation c_lo) and true at hi (c_hi).
+    Returns the (t, coop) points visited, and whether every one of them
+    lay within [c_hi, c_lo]. One that does not means cooperation is not
+    falling steadily across the bracket, so bisection stops there."""
+    points = []
+    while hi - lo > tol:
+        mid = (lo + hi) / 2
+        coop = evaluate(mid)
+        points.append((mid, coop))
+        if not c_hi <= coop <= c_lo:
+            return points, False
+        if below(coop):
+            hi = mid
+        else:
+            lo = mid
+    return points, True
+
+
+def refine(data, evaluate, tol, scan_step):
+    """Add points around the 50% crossing and the collapse to a coarse scan.
+    Bisects between the bracketing coarse points down to tol; where the
+    curve turns out not to be monotone, scans the bracket every scan_step
+    instead. The collapse is only searched for when cooperation stays at
+    zero to the end of the scan, after the last coarse point above zero.
+    Returns the combined data sorted by T."""
+    points = list(data)
+
+    def search(t1, c1, t2, c2, below):
+        found, monotone = bisect_t(evaluate, t1, t2, c1, c2, below, tol)
+        points.extend(found)
+        if not monotone:
+            seen = {round(t, 9) for t, _ in found}
+            n = max(2, round((t2 - t1) / scan_step))
+            for j in range(1, n):
+                t = t1 + (t2 - t1) * j / n
+                if round(t, 9) not in seen:
+                    points.append((t, evaluate(t)))
+
+    for i in range(len(data) - 1):
+        (t1, c1), (t2, c2) = data[i], data[i + 1]
+        if c1 >= 0.5 and c2 < 0.5:
+            search(t1, c1, t2, c2, lambda c: c < 0.5)
+            break
+    last = max((i for i, (_, c) in enumerate(data) if c > 0.0), default=None)
+    if last is not None and last < len(data) - 1:
+        (t1, c1), (t2, c2) = data[last], data[last + 1]
+        search(t1, c1, t2, c2, lambda c: c == 0.0)
+    return sorted(points)
 
 
 # ── ASCII plot ──────────────────────────────────────────────
 
+# Colors a phase-diagram cell can take, by index
+COLOR_TABLE = [DIM, B_CYN, B_YLW, B_MAG, B_WHT]
+
+
 def plot_phase_diagram(results_by_set, t_values):
     """Draw an ASCII phase diagram: cooperation% vs temptation T."""
 
     plot_w = 60
     plot_h = 20
 
-    # Characters for different sets
+    # Characters for different sets, and their index into COLOR_TABLE
     set_chars = {
-        "classic": ("●", B_CYN),
-        "retaliators": ("◆", B_YLW),
-        "full": ("■", B_MAG),
+        "classic": ("●", 1),
+        "retaliators": ("◆", 2),
+        "full": ("■", 3),
     }
 
-    # Build the plot grid
-    canvas = [[' '] * (plot_w + 1) for _ in range(plot_h + 1)]
-    colors = [[DIM] * (plot_w + 1) for _ in range(plot_h + 1)]
+    # Build the plot grid: flat glyph and color-index planes, where cell
+    # (r, c) is r * stride + c
+    stride = plot_w + 1
+    canvas = [' '] * (stride * (plot_h + 1))
+    colors = bytearray(stride * (plot_h + 1))  # 0 is DIM
 
     # Axes
     for r in range(plot_h + 1):
-        canvas[r][0] = '│'
-    for c in range(plot_w + 1):
-        canvas[plot_h][c] = '─'
-    canvas[plot_h][0] = '└'
+        canvas[r * stride] = '│'
+    bottom = plot_h * stride
+    canvas[bottom:bottom + stride] = ['─'] * stride
+    canvas[bottom] = '└'
 
     # Y-axis ticks
     for pct in (0, 25, 50, 75, 100):
         r = plot_h - int(pct / 100 * plot_h)
         if 0 <= r < plot_h:
-            canvas[r][0] = '┤'
+            canvas[r * stride] = '┤'
 
     # X-axis ticks
     t_min, t_max = t_values[0], t_values[-1]
     for t_tick in range(int(t_min), int(t_max) + 1):
         c = int((t_tick - t_min) / (t_max - t_min) * plot_w)
         if 0 < c <= plot_w:
-            canvas[plot_h][c] = '┬'
+            canvas[bottom + c] = '┬'
 
     # Plot data points
     for set_name, data in results_by_set.items():
-        ch, col = set_chars.get(set_name, ("·", B_WHT))
+        ch, col = set_chars.get(set_name, ("·", 4))
         for t, coop in data:
             c = int((t - t_min) / (t_max - t_min) * plot_w)
             r = plot_h - int(coop * plot_h)
             c = max(1, min(c, plot_w))
             r = max(0, min(r, plot_h - 1))
-            canvas[r][c] = ch
-            colors[r][c] = col
+            canvas[r * stride + c] = ch
+            colors[r * stride + c] = col
 
     # Render
     lines = []
@@ -287,7 +449,8 @@ def plot_phase_diagram(results_by_set, t_values):
         else:
             label = "    "
 
-        row_str = ''.join(f"{colors[r][c]}{canvas[r][c]}{RST}" for c in range(plot_w + 1))
+        row_str = ''.join(COLOR_TABLE[colors[k]] + canvas[k] + RST
+                          for k in range(r * stride, (r + 1) * stride))
         lines.append(f"  {DIM}{label}{RST} {row_str}")
 
     # X-axis labels
@@ -320,12 +483,14 @@ def find_critical_point(data):
 
 
 def find_collapse_point(data):
-    """Find where cooperation drops to zero."""
-    for i in range(len(data)):
-        t, c = data[i]
-        if c == 0.0:
-            return t
-    return None
+    """Find where cooperation drops to zero and stays there."""
+    collapse = None
+    for t, c in data:
+        if c > 0.0:
+            collapse = None
+        elif collapse is None:
+            collapse = t
+    return collapse
 
 
 # ── main ────────────────────────────────────────────────────
@@ -343,14 +508,20 @@ def main():
     if selected_sets is None:
         selected_sets = ["classic", "retaliators", "full"]
 
-    # Parameter sweep range
+    # Parameter sweep range. The full run scans coarsely, then bisects
+    # around the transitions down to a t_tol step (a step, not an accuracy:
+    # T* moves by more than that between seed sets), or scans every t_scan
+    # where cooperation does not fall steadily. --fast only scans.
+    t_scan = 0.15
     if fast:
         t_values = [t / 10 for t in range(30, 121, 5)]  # 3.0 to 12.0 by 0.5
+        t_tol = None
         grid_w, grid_h = 15, 15
         gens = 20
         n_seeds = 3
     else:
-        t_values = [t / 10 for t in range(30, 121, 3)]  # 3.0 to 12.0 by 0.3
+        t_values = [t / 100 for t in range(300, 1201, 75)]  # 3.0 to 12.0 by 0.75
+        t_tol = 0.1
         grid_w, grid_h = 20, 20
         gens = 30
         n_seeds = 5
@@ -367,61 +538,71 @@ def main():
     print(f"  {DIM}Question: at what temptation does cooperation collapse?{RST}")
     print()
 
-    # Run sweeps
+    # Run sweeps (each (T, seed) simulation runs in a worker process)
     results_by_set = {}
 
-    for set_name in selected_sets:
-        sset = STRATEGY_SETS[set_name]
-        strategy_classes = sset["classes"]
-        set_label = sset["name"]
+    with multiprocessing.Pool() as pool:
+        for set_name in selected_sets:
+            sset = STRATEGY_SETS[set_name]
+            strategy_classes = sset["classes"]
+            set_label = sset["name"]
 
-        ch_info = {"classic": (B_CYN, "●"), "retaliators": (B_YLW, "◆"),
-                   "full": (B_MAG, "■")}
-        col, ch = ch_info.get(set_name, (B_WHT, "·"))
+            ch_info = {"classic": (B_CYN, "●"), "retaliators": (B_YLW, "◆"),
+                       "full": (B_MAG, "■")}
+            col, ch = ch_info.get(set_name, (B_WHT, "·"))
 
-        print(f"  {col}{ch}{RST} {BLD}{set_label}{RST}")
+            print(f"  {col}{ch}{RST} {BLD}{set_label}{RST}")
 
-        data = []
-        for i, t in enumerate(t_values):
-            coop = run_averaged(
-                temptation=t,
+            sim_kwargs = dict(
                 strategy_classes=strategy_classes,
                 n_seeds=n_seeds,
                 width=grid_w, height=grid_h,
                 rounds_per_match=8,
                 generations=gens,
             )
-            data.append((t, coop))
 
-            # Progress bar
-            pct_done = (i + 1) / len(t_values)
-            bar_len = int(pct_done * 30)
-            bar = f"{col}{'█' * bar_len}{DIM}{'░' * (30 - bar_len)}{RST}"
-            coop_str = f"{B_GRN if coop > 0.5 else B_RED if coop < 0.2 else B_YLW}{coop*100:5.1f}%{RST}"
-            sys.stdout.write(f"\r    T={t:5.1f}  {bar}  coop={coop_str}       ")
-            sys.stdout.flush()
+            def show(t, coop, bar):
+                coop_str = f"{B_GRN if coop > 0.5 else B_RED if coop < 0.2 else B_YLW}{coop*100:5.1f}%{RST}"
+                sys.stdout.write(f"\r    T={t:5.2f}  {bar}  coop={coop_str}       ")
+                sys.stdout.flush()
 
-        print(f"\r    {'':70s}")  # clear progress line
+            def evaluate(t):
+                _, coop = next(sweep(pool, [t], **sim_kwargs))
+                show(t, coop, f"{col}{'refining':^30s}{RST}")
+                return coop
 
-        # Summary for this set
-        crit = find_critical_point(data)
-        collapse = find_collapse_point(data)
+            data = []
+            for i, (t, coop) in enumerate(sweep(pool, t_values, **sim_kwargs)):
+                data.append((t, coop))
 
-        if crit is not None:
-            print(f"    Critical point (50% cooperation): {col}T* ≈ {crit:.1f}{RST}")
-        else:
-            if data[-1][1] > 0.5:
-                print(f"    {B_GRN}Cooperation survives across entire range{RST}")
+                # Progress bar
+                pct_done = (i + 1) / len(t_values)
+                bar_len = int(pct_done * 30)
+                show(t, coop, f"{col}{'█' * bar_len}{DIM}{'░' * (30 - bar_len)}{RST}")
+
+            if t_tol is not None:
+                data = refine(data, evaluate, t_tol, t_scan)
+            print(f"\r    {'':70s}")  # clear progress line
+
+            # Summary for this set
+            crit = find_critical_point(data)
+            collapse = find_collapse_point(data)
+
+            if crit is not None:
+                print(f"    Critical point (50% cooperation): {col}T* ≈ {crit:.1f}{RST}")
             else:
-                print(f"    {B_RED}Cooperation never reached 50%{RST}")
+                if data[-1][1] > 0.5:
+                    print(f"    {B_GRN}Cooperation survives across entire range{RST}")
+                else:
+                    print(f"    {B_RED}Cooperation never reached 50%{RST}")
 
-        if collapse is not None:
-            print(f"    Total collapse: {DIM}T = {collapse:.1f}{RST}")
-        else:
-            print(f"    {DIM}Cooperation never fully collapses in this range{RST}")
+            if collapse is not None:
+                print(f"    Total collapse: {DIM}T = {collapse:.1f}{RST}")
+            else:
+                print(f"    {DIM}Cooperation never fully collapses in this range{RST}")
 
-        print()
-        results_by_set[set_name] = data
+            print()
+            results_by_set[set_name] = data
 
     # Phase diagram
     print(f"  {BLD}{'─' * 56}{RST}")
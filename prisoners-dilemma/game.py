@@ -18,12 +18,13 @@ DEFECT = False
 
 # Standard payoff matrix (Axelrod's values)
 # T > R > P > S  and  2R > T + S
-PAYOFFS = {
-    (COOPERATE, COOPERATE): 3,  # R: reward for mutual cooperation
-    (COOPERATE, DEFECT):    0,  # S: sucker's payoff
-    (DEFECT,    COOPERATE): 5,  # T: temptation to defect
-    (DEFECT,    DEFECT):    1,  # P: punishment for mutual defection
-}
+# Indexed as PAYOFFS[my_move][their_move]; moves are bools, so
+# DEFECT (False) is row/column 0 and COOPERATE (True) is 1.
+PAYOFFS = [
+    # vs DEFECT  vs COOPERATE
+    [1,          5],  # DEFECT:    P (punishment), T (temptation)
+    [0,          3],  # COOPERATE: S (sucker),     R (reward)
+]
 
 
 @dataclass
@@ -47,16 +48,21 @@ def play_match(a, b, rounds: int = 200) -> MatchResult:
     score_a = 0
     score_b = 0
 
+    # Bound once: the loop body is the hot path of every tournament.
+    # Strategies only read their histories, so they are passed as-is.
+    choose_a, choose_b = a.choose, b.choose
+    append_a, append_b = history_a.append, history_b.append
+    payoffs = PAYOFFS
+
     for _ in range(rounds):
-        # Each player sees the history so far (copies to prevent mutation)
-        move_a = a.choose(list(history_a), list(history_b))
-        move_b = b.choose(list(history_b), list(history_a))
+        move_a = choose_a(history_a, history_b)
+        move_b = choose_b(history_b, history_a)
 
-        score_a += PAYOFFS[(move_a, move_b)]
-        score_b += PAYOFFS[(move_b, move_a)]
+        score_a += payoffs[move_a][move_b]
+        score_b += payoffs[move_b][move_a]
 
-        history_a.append(move_a)
-        history_b.append(move_b)
+        append_a(move_a)
+        append_b(move_b)
 
     coop_a = sum(history_a) / rounds if rounds > 0 else 0
     coop_b = sum(history_b) / rounds if rounds > 0 else 0
@@ -126,7 +126,7 @@ class SpatialGrid:
                 for x in range(self.width):
                     my_move = moves[y][x]
                     for nx, ny in self.neighbors(x, y):
-                        scores[y][x] += PAYOFFS[(my_move, moves[ny][nx])]
+                        scores[y][x] += PAYOFFS[my_move][moves[ny][nx]]
         else:
             for y in range(self.height):
                 for x in range(self.width):
@@ -8,6 +8,9 @@ The beautiful thing about Axelrod's tournament: the winning strategies
 weren't the cleverest. They were nice (never defect first), retaliatory
 (punish defection), forgiving (don't hold grudges), and clear (be
 predictable so opponents can learn to cooperate with you).
+
+choose() only reads the two histories it is given and never mutates
+them, so callers may pass their own lists without copying.
 """
 
 import random
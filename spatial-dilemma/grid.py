@@ -99,7 +99,7 @@ class Grid:
                     for _ in range(rounds_per_match):
                         ma = a.choose(list(hist_a), list(hist_b))
                         mb = b.choose(list(hist_b), list(hist_a))
-                        self.scores[y][x] += PAYOFFS[(ma, mb)]
+                        self.scores[y][x] += PAYOFFS[ma][mb]
                         hist_a.append(ma)
                         hist_b.append(mb)
 